@@ -5,8 +5,9 @@ from mysql.connector import Error as MySQLError
 from psycopg2 import Error as PostgresError
 from datetime import datetime, timezone
 import re
-import statistics
 import math
+import numpy as np
+from operator import itemgetter
 import pandas as pd
 import logging
 from logging.handlers import RotatingFileHandler
@@ -271,39 +272,47 @@ class ZabbixDB:
         if operation not in self.VALID_STATISTICS:
             raise ZabbixDBError(f"Unsupported operation: {operation}")
             
-        values = []
-        for item in data:
-            try:
-                values.append(round(float(item['value']), 2))
-            except (TypeError, ValueError):
-                continue
-        
-        if not values:
+        # Position in data of every numeric value, None when all of them are numeric
+        positions = None
+        try:
+            values = np.fromiter((float(item['value']) for item in data), dtype=np.float64, count=len(data))
+        except (TypeError, ValueError):
+            positions, kept = [], []
+            for i, item in enumerate(data):
+                try:
+                    kept.append(float(item['value']))
+                except (TypeError, ValueError):
+                    continue
+                positions.append(i)
+            values = np.asarray(kept, dtype=np.float64)
+
+        if not values.size:
             return []
-        
-        if operation == 'min':
-            min_value = min(values)
-            return [item for item in data if round(float(item['value']), 2) == min_value]
-        elif operation == 'max':
-            max_value = max(values)
-            return [item for item in data if round(float(item['value']), 2) == max_value]
-        elif operation == 'last':
-            return [max(data, key=lambda x: x['clock'])]
+
+        if operation in ('min', 'max'):
+            # Compare the stored values exactly; rounded copies can tie values that differ
+            target = values.min() if operation == 'min' else values.max()
+            matches = np.flatnonzero(values == target)
+            return [data[i if positions is None else positions[i]] for i in matches]
+
+        np.round(values, 2, out=values)
+        if operation == 'last':
+            return [max(data, key=itemgetter('clock'))]
         elif operation in ('mean', 'avg'):
-            return statistics.fmean(values)
+            return float(values.mean())
         elif operation == 'median':
-            return statistics.median(values)
-        elif operation == 'stdev' and len(values) > 1:
-            return statistics.stdev(values)
+            return float(np.median(values))
+        elif operation == 'stdev' and values.size > 1:
+            return float(values.std(ddof=1))
         elif operation == 'sum':
-            return sum(values)
+            return float(values.sum())
         elif operation == 'count':
-            return len(values)
+            return int(values.size)
         elif operation == 'range':
-            return max(values) - min(values)
+            return float(np.ptp(values))
         elif operation == 'mad':
-            med = statistics.median(values)
-            return statistics.median([abs(x - med) for x in values])
+            med = np.median(values)
+            return float(np.median(np.abs(values - med)))
         return []
 
     def time_difference(self, time_from: int, time_to: int) -> int:
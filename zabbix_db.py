@@ -1,18 +1,291 @@
 from typing import Optional, Dict, Any
 import mysql.connector
+import mysql.connector.pooling
 import psycopg2
-from mysql.connector import Error as MySQLError
+import psycopg2.pool
+import psycopg2.errors
+from psycopg2.extras import RealDictCursor
+from mysql.connector import Error as MySQLError, HAVE_CEXT
+from mysql.connector.errors import PoolError
 from psycopg2 import Error as PostgresError
-from datetime import datetime, timezone
 import re
-import statistics
 import math
+import numpy as np
 import pandas as pd
+from cachetools import LRUCache, TTLCache
 import os
+import io
 import json
+import itertools
+import functools
+from operator import itemgetter
+from collections import defaultdict, namedtuple
+import threading
+import weakref
+import time
+
+try:
+    import numba
+except ImportError:  # optional; MAD falls back to the NumPy path without it
+    numba = None
+
+# Sentinel for cache lookups, since None is a valid cached result
+_MISSING = object()
+
+# Structure-of-arrays form of a numeric range: int64 clocks, float64 values
+MetricColumns = namedtuple('MetricColumns', ['clock', 'value'])
+
+# Duration parts like '1d', '2h', '30m' and their length in days
+_DUR_RE = re.compile(r'(\d+)([dhm])')
+_DUR_FACTOR = {'d': 1.0, 'h': 1 / 24.0, 'm': 1 / 1440.0}
+
+
+def _as_point(row):
+    """Return a history row, dict or ``(clock, value)`` tuple, as a {'clock', 'value'} dict."""
+    return row if isinstance(row, dict) else {'clock': row[0], 'value': row[1]}
+
+
+def _median(values, overwrite: bool = False):
+    """
+    Median of a 1-D array by introselect (np.partition), O(n) with no full sort.
+
+    Both middle elements of an even-sized array are selected in one pass.
+    With ``overwrite=True`` the array is partitioned in place, which saves a
+    copy when the caller no longer needs it.
+    """
+    k = values.size // 2
+    kth = k if values.size % 2 else (k - 1, k)
+    if overwrite:
+        values.partition(kth)
+        part = values
+    else:
+        part = np.partition(values, kth)
+    if values.size % 2:
+        return part[k]
+    return 0.5 * (part[k - 1] + part[k])
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _select_median(buf):
+        """Median of ``buf`` by in-place Hoare quickselect; reorders ``buf``."""
+        n = buf.size
+        k = n // 2
+        lo, hi = 0, n - 1
+        while lo < hi:
+            pivot = buf[(lo + hi) // 2]
+            i, j = lo, hi
+            while i <= j:
+                while buf[i] < pivot:
+                    i += 1
+                while buf[j] > pivot:
+                    j -= 1
+                if i <= j:
+                    buf[i], buf[j] = buf[j], buf[i]
+                    i += 1
+                    j -= 1
+            if k <= j:
+                hi = j
+            elif k >= i:
+                lo = i
+            else:
+                break
+        if n % 2:
+            return buf[k]
+        # Everything left of k is <= buf[k], so the lower middle is the largest of them
+        lower = buf[0]
+        for i in range(1, k):
+            if buf[i] > lower:
+                lower = buf[i]
+        return 0.5 * (lower + buf[k])
+
+    @numba.njit(cache=True, fastmath=True)
+    def _mad_kernel(buf):
+        """
+        Median absolute deviation of a float64 array, overwriting it.
+
+        The deviations are written back into ``buf`` (selection only needs the
+        multiset, not the order), so unlike the NumPy path no temporary array
+        is allocated.
+        """
+        med = _select_median(buf)
+        for i in range(buf.size):
+            buf[i] = abs(buf[i] - med)
+        return _select_median(buf)
+else:
+    _mad_kernel = None
+
+
+# Errors meaning the connection dropped or the server went away; worth a retry
+_CONNECTION_ERRORS = (
+    mysql.connector.errors.OperationalError,
+    mysql.connector.errors.InterfaceError,
+    psycopg2.OperationalError,
+    psycopg2.InterfaceError
+)
+
+
+def _retry(times: int = 3, backoff: float = 0.2, exceptions: tuple = _CONNECTION_ERRORS):
+    """
+    Retry the decorated method on ``exceptions``, sleeping ``backoff * 2**attempt`` in between.
+
+    If an earlier attempt left the instance without a connection (its
+    reconnect failed too), a fresh one is checked out before trying again,
+    so a retry never runs into the "not connected" early return. The error
+    from the last attempt, which may be the failed checkout, is raised to
+    the caller. Methods wrapped by it let database errors propagate rather
+    than returning them, so the transient ones reach this retry loop.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            for attempt in range(times):
+                try:
+                    if attempt and self.connection is None:
+                        self.connect()
+                    return func(self, *args, **kwargs)
+                except exceptions:
+                    if attempt == times - 1:
+                        raise
+                    time.sleep(backoff * 2 ** attempt)
+        return wrapper
+    return decorator
+
+
+class _RunningStats:
+    """
+    Single-pass count/sum/mean/variance/min/max over chunks of values.
+
+    Each NumPy chunk is reduced on its own and merged with the parallel form of
+    Welford's update (Chan et al.), so a streamed range is summarized in
+    constant memory without a second pass for the variance.
+    """
+    __slots__ = ('n', 'mean', 'M2', 'mn', 'mx', 'sm')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.mn = math.inf
+        self.mx = -math.inf
+        self.sm = 0.0
+
+    def push(self, values) -> None:
+        """Fold a 1-D float64 array into the running totals."""
+        m = values.size
+        if not m:
+            return
+        chunk_mean = float(values.mean())
+        chunk_M2 = float(np.square(values - chunk_mean).sum())
+
+        n = self.n + m
+        delta = chunk_mean - self.mean
+        self.mean += delta * m / n
+        self.M2 += chunk_M2 + delta * delta * self.n * m / n
+        self.n = n
+        self.sm += float(values.sum())
+        self.mn = min(self.mn, float(values.min()))
+        self.mx = max(self.mx, float(values.max()))
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.M2 / (self.n - 1))
+
+
+class _LazyMySQLPool(mysql.connector.pooling.MySQLConnectionPool):
+    """
+    MySQLConnectionPool that opens its connections on demand.
+
+    The stock pool connects ``pool_size`` times in its constructor. This one
+    starts empty and opens a connection only when a checkout finds none idle,
+    up to ``pool_size``; past that it raises PoolError like the stock pool.
+    """
+
+    def __init__(self, pool_size: int, pool_name: str, **config):
+        # Without connection arguments the base constructor opens nothing
+        super().__init__(pool_size=pool_size, pool_name=pool_name)
+        self.set_config(**config)
+        self._opened = 0
+        self._grow_lock = threading.Lock()
+
+    def get_connection(self):
+        with self._grow_lock:
+            try:
+                return super().get_connection()
+            except PoolError:
+                if self._opened >= self.pool_size:
+                    raise
+            self.add_connection()
+            self._opened += 1
+            return super().get_connection()
+
 
 class ZabbixDB:
     """A class to handle Zabbix database connections and queries for host status."""
+
+    # Connection pools shared by every instance pointing at the same database
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    # Names PREPAREd on each pooled PostgreSQL connection. They live as long as the
+    # session, so they are kept across checkouts instead of being prepared again.
+    _pg_prepared = weakref.WeakKeyDictionary()
+
+    # Rows pulled per round-trip when streaming history/trend ranges
+    _FETCH_SIZE = 10_000
+
+    # History/trend tables per item value_type (float, str, log, uint, text)
+    _TABLE_MAPPING = (
+        {'history': 'history', 'trends': 'trends'},
+        {'history': 'history_str', 'trends': None},
+        {'history': 'history_log', 'trends': None},
+        {'history': 'history_uint', 'trends': 'trends_uint'},
+        {'history': 'history_text', 'trends': None}
+    )
+
+    # Whitelists for table names interpolated into queries
+    _HISTORY_TABLES = frozenset({'history', 'history_str', 'history_log', 'history_uint', 'history_text'})
+    _NUMERIC_HISTORY_TABLES = frozenset({'history', 'history_uint'})
+    _TREND_TABLES = frozenset({'trends', 'trends_uint'})
+    _ALL_TABLES = _HISTORY_TABLES | _TREND_TABLES
+    _NUMERIC_TABLES = _NUMERIC_HISTORY_TABLES | _TREND_TABLES
+
+    _VALID_STATS = frozenset({'min', 'max', 'mean', 'median', 'stdev', 'sum', 'count', 'range', 'mad', 'nmad', 'last', 'avg', 'describe'})
+
+    # Statistics that can be folded chunk by chunk without keeping the range
+    _STREAMING_STATS = {'min', 'max', 'mean', 'avg', 'stdev', 'sum', 'count', 'range'}
+
+    # Statistics the database can reduce itself, so only one row crosses the wire;
+    # {col} is 'value' on history and the matching value_* column on trends
+    _SQL_AGG = {
+        'mean': 'AVG({col})',
+        'avg': 'AVG({col})',
+        'min': 'MIN({col})',
+        'max': 'MAX({col})',
+        'sum': 'SUM({col})',
+        'count': 'COUNT(*)',
+        'stdev': 'STDDEV_SAMP({col})',
+        'range': 'MAX({col}) - MIN({col})'
+    }
+
+    # Scale turning the MAD into a consistent estimator of the standard deviation
+    _NMAD_SCALE = 1.4826
+
+    # Order statistics only PostgreSQL reduces (percentile_cont). The MAD ones
+    # repeat the range filter in a scalar subquery with its own three parameters.
+    _PG_SQL_AGG = {
+        'median': 'percentile_cont(0.5) WITHIN GROUP (ORDER BY {col})',
+        'mad': (
+            'percentile_cont(0.5) WITHIN GROUP (ORDER BY abs({col} - ('
+            'SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY {col}) '
+            'FROM {table} WHERE itemid = %s AND clock BETWEEN %s AND %s)))'
+        ),
+        'nmad': (
+            f'{_NMAD_SCALE} * percentile_cont(0.5) WITHIN GROUP (ORDER BY abs({{col}} - ('
+            'SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY {col}) '
+            'FROM {table} WHERE itemid = %s AND clock BETWEEN %s AND %s)))'
+        )
+    }
     
     def __init__(
         self,
@@ -48,127 +321,563 @@ class ZabbixDB:
         self.password = password
         self.connection = None
 
+        # Short-lived caches for repeated dashboard queries; see refresh()
+        self._meta_cache = TTLCache(maxsize=1024, ttl=30)
+        # Item definitions, keyed by (item_name, hostname)
+        self._item_cache = TTLCache(maxsize=4096, ttl=60)
+        self._data_cache = TTLCache(maxsize=1024, ttl=60)
+        # Group membership changes on the scale of minutes to hours
+        self._group_cache = TTLCache(maxsize=128, ttl=300)
+        self._alerts_cache = LRUCache(maxsize=128)
+        self._cache_lock = threading.Lock()
+
+    @property
+    def connection(self):
+        """The connection this instance has checked out of the pool, if any."""
+        return self._connection
+
+    @connection.setter
+    def connection(self, value):
+        self._connection = value
+        # Prepared statements belong to the connection they were prepared on
+        if self.db_type == 'postgresql' and value is not None:
+            with ZabbixDB._pools_lock:
+                self._prepared = ZabbixDB._pg_prepared.setdefault(value, {})
+        else:
+            self._prepared = {}
+
+    def _get_pool(self):
+        """
+        Return the connection pool for this database, creating it on first use.
+
+        Pools live at class level so repeated ``with ZabbixDB(...)`` blocks reuse
+        warm connections instead of paying TCP/TLS/auth on every instantiation.
+        They only help within one process; for cross-process pooling put
+        PgBouncer (transaction mode) or ProxySQL in front of the database.
+
+        The MySQL pool opens connections as checkouts need them (see
+        _LazyMySQLPool), so a cold start pays for one connection, not 25. Once
+        all 25 are checked out it raises PoolError instead of blocking. The
+        PostgreSQL pool likewise opens a single connection up front and the
+        rest on demand, keeps one idle connection warm (psycopg2 closes
+        returned connections beyond minconn) and raises PoolError past 50.
+        """
+        key = (self.db_type, self.host, self.port, self.database, self.user, self.password)
+        with ZabbixDB._pools_lock:
+            pool = ZabbixDB._pools.get(key)
+            if pool is None:
+                if self.db_type == 'mysql':
+                    pool = _LazyMySQLPool(
+                        pool_name=f"zabbix_{len(ZabbixDB._pools)}",
+                        pool_size=25,
+                        host=self.host,
+                        port=self.port,
+                        database=self.database,
+                        user=self.user,
+                        password=self.password,
+                        charset='utf8mb4',
+                        # C extension decodes rows far faster; use the pure-Python protocol only without it
+                        use_pure=not HAVE_CEXT
+                    )
+                else:  # postgresql
+                    pool = psycopg2.pool.ThreadedConnectionPool(
+                        minconn=1,
+                        maxconn=50,
+                        host=self.host,
+                        port=self.port,
+                        database=self.database,
+                        user=self.user,
+                        password=self.password
+                    )
+                ZabbixDB._pools[key] = pool
+        return pool
+
     def connect(self) -> None:
-        """Establish a connection to the Zabbix database."""
+        """Check out a connection to the Zabbix database from the pool."""
         try:
+            pool = self._get_pool()
             if self.db_type == 'mysql':
-                self.connection = mysql.connector.connect(
-                    host=self.host,
-                    port=self.port,
-                    database=self.database,
-                    user=self.user,
-                    password=self.password,
-                    charset='utf8mb4',
-                    use_pure=True
-                )
+                self.connection = pool.get_connection()
             else:  # postgresql
-                self.connection = psycopg2.connect(
-                    host=self.host,
-                    port=self.port,
-                    database=self.database,
-                    user=self.user,
-                    password=self.password
-                )
+                self.connection = pool.getconn()
         except (MySQLError, PostgresError) as e:
             raise
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
+        """Return the database connection to the pool and drop the cached results."""
+        self._release()
+        self.refresh()
+
+    def _release(self) -> None:
+        """Return this instance's connection to the pool, keeping the caches."""
+        if self.connection:
+            try:
+                self._release_prepared()
+                if self.db_type == 'mysql':
+                    # close() on a pooled connection hands it back to the pool
+                    self.connection.close()
+                else:  # postgresql
+                    self._get_pool().putconn(self.connection)
+            except (MySQLError, PostgresError):
+                pass
         self.connection = None
+
+    def _alive(self) -> bool:
+        """
+        Whether this instance has a connection checked out.
+
+        This is a flag check, not a round-trip: connect() sets the connection
+        and close() clears it. A connection that dropped in between surfaces on
+        the next query and is handled by _with_reconnect(); use ping() for an
+        explicit health check.
+        """
+        return self.connection is not None
+
+    def ping(self) -> bool:
+        """Check with a round-trip to the server that this instance's connection is usable."""
+        if self.connection is None:
+            return False
+        if self.db_type == 'mysql':
+            return self.connection.is_connected()
+        # postgresql: .closed only reflects a close seen by the client
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except PostgresError:
+            return False
+
+    def _reconnect(self) -> None:
+        """Discard the broken connection and check out a fresh one."""
+        # The server side of these is gone along with the connection
+        self._prepared.clear()
+        try:
+            if self.db_type == 'mysql':
+                self.connection.close()
+            else:  # postgresql
+                self._get_pool().putconn(self.connection, close=True)
+        except (MySQLError, PostgresError):
+            pass
+        self.connection = None
+        self.connect()
+
+    def _with_reconnect(self, func, *args):
+        """Call ``func``; if the connection turned out to be dead, reconnect and try once more."""
+        try:
+            return func(*args)
+        except _CONNECTION_ERRORS:
+            self._reconnect()
+            return func(*args)
+
+    def _prepared_cursor(self, sql_key: str, sql: str, dictionary: bool = True):
+        """
+        Return the cached MySQL prepared cursor for ``sql_key`` and its SQL text.
+
+        MySQLCursorPrepared only skips re-preparing when it is handed the very
+        same string object again, so the text is cached alongside the cursor.
+        """
+        entry = self._prepared.get(sql_key)
+        if entry is None:
+            entry = (self.connection.cursor(prepared=True, dictionary=dictionary), sql)
+            self._prepared[sql_key] = entry
+        return entry
+
+    def _exec(self, sql_key: str, sql: str, params: tuple) -> list:
+        """
+        Run a hot query as a prepared statement and return all rows as dicts.
+
+        The statement is parsed and planned once per connection and ``sql_key``;
+        later calls only send the parameters (COM_STMT_EXECUTE on MySQL,
+        EXECUTE on PostgreSQL).
+        """
+        return self._with_reconnect(self._run_prepared, sql_key, sql, params)
+
+    def _run_prepared(self, sql_key: str, sql: str, params: tuple) -> list:
+        """Single attempt of _exec()."""
+        if self.db_type == 'mysql':
+            cursor, sql = self._prepared_cursor(sql_key, sql)
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+        # postgresql: one PREPARE per (connection, sql_key), reused by every later checkout
+        name = f"zbx_{sql_key}"
+        if sql_key not in self._prepared:
+            self._pg_prepare(name, sql)
+            self._prepared[sql_key] = name
+
+        placeholders = ', '.join(['%s'] * len(params))
+        try:
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+                return cursor.fetchall()
+        except psycopg2.errors.InvalidSqlStatementName:
+            # The session lost it (e.g. DISCARD ALL from a pooler); prepare it again
+            self.connection.rollback()
+            self._pg_prepare(name, sql)
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+                return cursor.fetchall()
+
+    def _pg_prepare(self, name: str, sql: str) -> None:
+        """PREPARE ``sql`` as ``name`` on PostgreSQL, which wants $n placeholders instead of %s."""
+        position = itertools.count(1)
+        pg_sql = re.sub(r'%s', lambda _: f"${next(position)}", sql)
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"PREPARE {name} AS {pg_sql}")
+        except psycopg2.errors.DuplicatePreparedStatement:
+            # Already prepared in this session by an earlier checkout
+            self.connection.rollback()
+
+    def _release_prepared(self) -> None:
+        """
+        Close this instance's MySQL prepared cursors before the connection goes back to the pool.
+
+        The pool resets MySQL sessions on return, which deallocates them
+        server-side anyway. PostgreSQL statements stay prepared on the
+        connection for the next checkout, see _pg_prepared.
+        """
+        if self.db_type != 'mysql':
+            return
+        prepared = self._prepared
+        try:
+            for cursor, _ in prepared.values():
+                cursor.close()
+        finally:
+            prepared.clear()
+
+    def refresh(self) -> None:
+        """Drop all cached query results so the next calls hit the database."""
+        with self._cache_lock:
+            self._meta_cache.clear()
+            self._item_cache.clear()
+            self._data_cache.clear()
+            self._group_cache.clear()
+            self._alerts_cache.clear()
+
+    def _cache_get(self, cache, key):
+        """Thread-safe lookup returning _MISSING when the key is absent or expired."""
+        with self._cache_lock:
+            return cache.get(key, _MISSING)
+
+    def _cache_set(self, cache, key, value):
+        """Thread-safe store into one of the TTL caches."""
+        with self._cache_lock:
+            cache[key] = value
     
+    def _iter_rows(self, query: str, params: tuple, sql_key: str = None, dictionary: bool = True):
+        """
+        Stream the rows of ``query`` through a server-side cursor.
+
+        Rows are pulled _FETCH_SIZE at a time (unbuffered cursor on MySQL,
+        named cursor on PostgreSQL), so a long range never has to sit in
+        client memory all at once. On MySQL, passing ``sql_key`` runs the
+        query through a reusable prepared cursor, which streams the same way.
+        With ``dictionary=False`` rows are plain tuples, which is much lighter
+        than a dict per row for the two-column history scans.
+        """
+        # Only the execute is retried; once rows have been handed out a drop just raises
+        cursor, keep_open = self._with_reconnect(self._open_cursor, query, params, sql_key, dictionary)
+        try:
+            while True:
+                rows = cursor.fetchmany(self._FETCH_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # An unbuffered MySQL cursor refuses to close or re-execute with rows still pending
+            if self.db_type == 'mysql' and self.connection.unread_result:
+                cursor.fetchall()
+            if not keep_open:
+                cursor.close()
+
+    def _open_cursor(self, query: str, params: tuple, sql_key: str, dictionary: bool):
+        """Create the streaming cursor for _iter_rows() and execute ``query`` on it."""
+        keep_open = False
+        if self.db_type == 'mysql' and sql_key:
+            cursor, query = self._prepared_cursor(sql_key, query, dictionary)
+            keep_open = True
+        elif self.db_type == 'mysql':
+            cursor = self.connection.cursor(dictionary=dictionary, buffered=False)
+        else:  # postgresql, DECLARE cannot wrap an EXECUTE so no prepared statement here
+            cursor = self.connection.cursor(name='zbx_hist', cursor_factory=RealDictCursor if dictionary else None)
+            cursor.itersize = self._FETCH_SIZE
+        cursor.execute(query, params)
+        return cursor, keep_open
+
+    def _copy_columns(self, query: str, params: tuple):
+        """
+        Fetch a ``clock, value`` query on PostgreSQL through COPY ... TO STDOUT.
+
+        COPY ships the result as one CSV stream that is parsed straight into
+        NumPy arrays, skipping psycopg2's per-row tuple construction.
+
+        Returns:
+            tuple: (clocks, values) as int64/float64 arrays.
+        """
+        def copy():
+            buffer = io.StringIO()
+            with self.connection.cursor() as cursor:
+                bound = cursor.mogrify(query, params).decode()
+                cursor.copy_expert(f"COPY ({bound}) TO STDOUT WITH (FORMAT CSV)", buffer)
+            return buffer
+
+        buffer = self._with_reconnect(copy)
+
+        if not buffer.tell():
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        buffer.seek(0)
+        frame = pd.read_csv(buffer, header=None, names=['clock', 'value'], dtype={'clock': np.int64, 'value': np.float64})
+        return frame['clock'].to_numpy(), frame['value'].to_numpy()
+
+    def _columns(self, data):
+        """
+        Collapse rows into ``(clocks, values)`` NumPy arrays.
+
+        Rows may be dicts or ``(clock, value)`` tuples. Lists are converted in
+        one go; any other iterable (e.g. _iter_rows) is consumed in _FETCH_SIZE
+        chunks so only the two arrays are ever kept. A ``(clocks, values)``
+        tuple of arrays is passed through as is.
+        """
+        if isinstance(data, tuple):
+            return data
+
+        if isinstance(data, list) and data and not isinstance(data[0], dict):
+            clocks = np.fromiter((row[0] for row in data), dtype=np.int64, count=len(data))
+            values = np.fromiter((float(row[1]) for row in data), dtype=np.float64, count=len(data))
+            return clocks, values
+
+        if isinstance(data, list):
+            clocks = np.fromiter((item['clock'] for item in data), dtype=np.int64, count=len(data))
+            values = np.fromiter((float(item['value']) for item in data), dtype=np.float64, count=len(data))
+            return clocks, values
+
+        clock_chunks, value_chunks = [], []
+        for clocks, values in self._chunks(data):
+            clock_chunks.append(clocks)
+            value_chunks.append(values)
+
+        if not clock_chunks:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return np.concatenate(clock_chunks), np.concatenate(value_chunks)
+
+    def _chunks(self, rows):
+        """Yield ``(clocks, values)`` arrays for each _FETCH_SIZE slice of a row iterable."""
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, self._FETCH_SIZE))
+            if not chunk:
+                return
+            yield self._columns(chunk)
+
+    def _compute_streaming(self, rows, operation: str):
+        """
+        compute_statistic for a row iterable, folded one chunk at a time.
+
+        Only the running totals (and, for 'min'/'max', the rows matching the
+        current extreme) are kept, so memory stays flat however long the range.
+        """
+        stats = _RunningStats()
+        best = None
+        hits = []
+        for clocks, values in self._chunks(rows):
+            if operation in ('min', 'max'):
+                # Exact comparison on the stored values, as _fetch_extreme does in SQL
+                target = values.min() if operation == 'min' else values.max()
+                if best is None or (target < best if operation == 'min' else target > best):
+                    best, hits = target, []
+                if target == best:
+                    hits.extend(
+                        {'clock': int(clocks[i]), 'value': float(values[i])}
+                        for i in np.flatnonzero(values == best)
+                    )
+                continue
+
+            # Chunks are fresh arrays, so round in place
+            np.round(values, 2, out=values)
+            stats.push(values)
+
+        if operation in ('min', 'max'):
+            return hits
+        if not stats.n:
+            return []
+        elif operation in ('mean', 'avg'):
+            return stats.mean
+        elif operation == 'stdev':
+            # Too few values for a sample stdev: empty, as the SQL path returns
+            return stats.stdev if stats.n > 1 else []
+        elif operation == 'sum':
+            return stats.sm
+        elif operation == 'count':
+            return stats.n
+        return stats.mx - stats.mn  # range
+
     def compute_statistic(self, data: list, operation: str):
         """
         Computes a statistical measure on a list of dicts with 'clock' and 'value'.
 
         Args:
-            data (list): List of dicts with keys 'clock' and 'value'.
+            data (list): List of dicts with keys 'clock' and 'value' (or of
+                ``(clock, value)`` tuples), any iterable of such rows (e.g. a
+                streamed cursor), or a ``(clocks, values)`` tuple of NumPy
+                arrays such as the MetricColumns from ``columnar=True`` fetches.
             operation (str): One of [
                 'min', 'max', 'mean', 'median', 'stdev', 'sum', 'count',
-                'range', 'mad', 'last'
+                'range', 'mad', 'nmad', 'last', 'describe'
             ]
 
         Returns:
             - For 'min'/'max': List[dict] with matching clock and value
             - For 'last': Single dict with latest clock and value
+            - For 'describe': Dict of summary statistics, see describe()
             - For others: Single float/int result
+            - [] for no data, or for 'stdev' over fewer than two values
         """
-        if not data:
+        if isinstance(data, list) and not data:
             return []
         # operation = operation.lower()
-        values = [round(item['value'],2) for item in data]
 
-        if operation == 'min':
-            min_value = min(values)
-            return [item for item in data if item['value'] == min_value]
+        if operation == 'last':
+            # Works for string/log/text history too, so it runs before the float conversion
+            if isinstance(data, tuple):
+                clocks, values = data
+                if not clocks.size:
+                    return []
+                latest = int(np.argmax(clocks))
+                return [{'clock': int(clocks[latest]), 'value': float(values[latest])}]
+            if isinstance(data, list) and isinstance(data[0], dict):
+                clocks = np.fromiter((item['clock'] for item in data), dtype=np.int64, count=len(data))
+                return [data[int(np.argmax(clocks))]]
+            # Any other rows: one C-level max() over the clock field, no per-row lambda
+            rows = iter(data)
+            first = next(rows, None)
+            if first is None:
+                return []
+            latest = max(itertools.chain((first,), rows), key=itemgetter('clock') if isinstance(first, dict) else itemgetter(0))
+            return [_as_point(latest)]
 
-        elif operation == 'max':
-            max_value = max(values)
-            return [item for item in data if item['value'] == max_value]
+        if operation == 'describe':
+            return self.describe(data)
 
-        elif operation == 'last':
-            return [max(data, key=lambda x: x['clock'])]
+        if not isinstance(data, (list, tuple)) and operation in self._STREAMING_STATS:
+            return self._compute_streaming(data, operation)
 
-        elif operation in ('mean', 'avg'):
-            return statistics.fmean(values)
+        clocks, raw_values = self._columns(data)
+        if not raw_values.size:
+            return []
+        if operation in ('min', 'max'):
+            # One vectorized reduction plus one vectorized compare, exact on the stored
+            # values (as _fetch_extreme does in SQL) rather than on rounded copies
+            target = raw_values.min() if operation == 'min' else raw_values.max()
+            indices = np.flatnonzero(raw_values == target)
+            # Streamed and tuple rows are not kept as dicts, so rebuild them from the arrays
+            if isinstance(data, list) and isinstance(data[0], dict):
+                return [data[i] for i in indices]
+            return [{'clock': int(clocks[i]), 'value': float(raw_values[i])} for i in indices]
+
+        # Arrays built by _columns are ours to overwrite; caller-supplied ones are not
+        owned = not isinstance(data, tuple)
+        values = np.round(raw_values, 2, out=raw_values if owned else None)
+
+        if operation in ('mean', 'avg'):
+            return float(values.mean())
 
         elif operation == 'median':
-            return statistics.median(values)
+            return float(_median(values, overwrite=owned))
 
         elif operation == 'stdev':
-            return statistics.stdev(values)
+            # Too few values for a sample stdev: empty, as the SQL path returns
+            return float(values.std(ddof=1)) if values.size > 1 else []
 
         elif operation == 'sum':
-            return sum(values)
+            return float(values.sum())
 
         elif operation == 'count':
-            return len(values)
+            return int(values.size)
 
         elif operation == 'range':
-            return max(values) - min(values)
+            return float(np.ptp(values))
 
-        elif operation == 'mad':
-            med = statistics.median(values)
-            return statistics.median([abs(x - med) for x in values])
+        elif operation in ('mad', 'nmad'):
+            if _mad_kernel is not None:
+                # values is ours either way here (np.round copies caller arrays)
+                mad = float(_mad_kernel(np.ascontiguousarray(values, dtype=np.float64)))
+            else:
+                med = _median(values)
+                # The deviations are a fresh array, so take abs and select on it in place
+                dev = values - med
+                np.abs(dev, out=dev)
+                mad = float(_median(dev, overwrite=True))
+            # nmad is comparable with stdev for normally distributed data
+            return mad * self._NMAD_SCALE if operation == 'nmad' else mad
 
         else:
             raise ValueError(f"Unsupported operation: {operation}")
         
-    def time_difference(self, time_from: int, time_to: int) -> int:
+    def describe(self, data):
         """
-        Calculates the difference in days between two Unix timestamps.
+        Summary statistics of metric data in one go, like pandas' describe().
+
+        The values are converted to one NumPy array once and every statistic
+        is reduced from it, instead of a compute_statistic() call per measure
+        each rebuilding the array. Accepts the same inputs as compute_statistic.
+
+        Returns:
+            dict: count, mean, std (None below two values), min, median, max
+            and sum, or [] when there is no data.
         """
-        dt_from = datetime.fromtimestamp(time_from, tz=timezone.utc)
-        dt_to = datetime.fromtimestamp(time_to, tz=timezone.utc)
-        delta = dt_to - dt_from
-        return delta.days
+        if isinstance(data, list) and not data:
+            return []
+        _, raw_values = self._columns(data)
+        if not raw_values.size:
+            return []
+        values = np.round(raw_values, 2, out=None if isinstance(data, tuple) else raw_values)
+
+        return {
+            'count': int(values.size),
+            'mean': float(values.mean()),
+            'std': float(values.std(ddof=1)) if values.size > 1 else None,
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'sum': float(values.sum()),
+            # Last, as partitioning reorders the array
+            'median': float(_median(values, overwrite=not isinstance(data, tuple)))
+        }
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def time_difference(time_from: int, time_to: int) -> int:
+        """
+        Calculates the difference in whole days between two Unix timestamps.
+
+        Plain integer division gives the same result as the days of a
+        timedelta (both floor) without building two datetimes.
+        """
+        return int((time_to - time_from) // 86400)
     
-    def convert_day(self, duration: str):
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def convert_day(duration: str):
         """
         Converts a duration string like '1d', '1h', '3d', '1m' to total days.
         Supports combinations like '1d2h30m'.
-        """
-        # Regex to find all parts (e.g., '1d', '2h', '30m')
-        matches = re.findall(r'(\d+)([dhm])', duration.lower())
-
-        total_days = 0.0
-        for value, unit in matches:
-            value = int(value)
-            if unit == 'd':
-                total_days += value
-            elif unit == 'h':
-                total_days += value / 24
-            elif unit == 'm':
-                total_days += value / (24 * 60)
 
+        Results are memoized: item retention periods ('7d', '90d', '365d')
+        repeat on nearly every get_metric_data call.
+        """
+        total_days = sum((int(value) * _DUR_FACTOR[unit] for value, unit in _DUR_RE.findall(duration.lower())), 0.0)
         return round(total_days, 2)
     
     def get_monitoring_Status(self, hostname: str):
 
-        if not self.connection or not self.connection.is_connected():
+        if not self._alive():
             return RuntimeError("Database connection not established")
 
+        cache_key = ('status', hostname)
+        cached = self._cache_get(self._meta_cache, cache_key)
+        if cached is not _MISSING:
+            return cached
+
         host_status_query = """
         SELECT h.hostid, h.host, h.status
         FROM hosts h
@@ -176,25 +885,39 @@ class ZabbixDB:
         """
         
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(host_status_query, (hostname,))
-            result = cursor.fetchone()
-            cursor.close()
+            rows = self._exec('host_status', host_status_query, (hostname,))
+            result = rows[0] if rows else None
 
-            if result['status'] != 1:
-                return 0 # 0 = enabled, 1 = disabled
-            
-            else:
-                return 1 # 0 = enabled, 1 = disabled
+            status = 0 if result['status'] != 1 else 1 # 0 = enabled, 1 = disabled
+            self._cache_set(self._meta_cache, cache_key, status)
+            return status
         
         except (MySQLError, PostgresError) as e:
             return RuntimeError(f"Query failed: {str(e)}")
 
     def get_host_by_group(self,host_group):
         """
-        Function to get the host group for a given host.
-        This is a placeholder function; implement the actual logic as needed.
+        Fetch the hosts that belong to a host group.
+
+        Args:
+            host_group (str): The host group name, or 'all' for every enabled host.
+
+        Returns:
+            List[Dict[str, Any]]: One row per host with ``host_name`` (and
+            ``group_name`` for a named group).
+
+        Results are cached per group for five minutes; call refresh() to drop them.
         """
+        if not self._alive():
+            return RuntimeError("Database connection not established")
+
+        # Group names compare case-insensitively under MySQL's default collation, not on PostgreSQL
+        cache_key = host_group.lower() if self.db_type == 'mysql' or host_group.lower() == 'all' else host_group
+        cached = self._cache_get(self._group_cache, cache_key)
+        if cached is not _MISSING:
+            # Copies, so a caller editing its result cannot change the cached rows
+            return [dict(row) for row in cached]
+
         query = """
         SELECT 
         g.name AS group_name,
@@ -213,21 +936,19 @@ class ZabbixDB:
         """
 
         try:
-            cursor = self.connection.cursor(dictionary=True)
             if host_group.lower() == 'all':
-                cursor.execute(query_all_groups)
+                rows = self._iter_rows(query_all_groups, ())
             else:
-                cursor.execute(query, (host_group,))
-            result = cursor.fetchall()
-            cursor.close()
+                rows = self._exec('host_group', query, (host_group,))
+            result = [dict(row) for row in rows]
 
-            if result is None:
-                return []
-            return result
+            self._cache_set(self._group_cache, cache_key, result)
+            return [dict(row) for row in result]
     
         except (MySQLError, PostgresError) as e:
             return RuntimeError(f"Query failed: {str(e)}")
         
+    @_retry(times=3, backoff=0.2)
     def get_item_detail(self, item_name: str, hostname: str = None):
         """
         Fetch details of a specific item. Returns one item if hostname is provided,
@@ -242,10 +963,16 @@ class ZabbixDB:
 
         Raises:
             RuntimeError: If database connection is not established or query fails.
+            OperationalError/InterfaceError: If the connection keeps failing after retries.
         """
-        if not self.connection or not self.connection.is_connected():
+        if not self._alive():
             raise RuntimeError("No active database connection")
 
+        cache_key = (item_name, hostname)
+        cached = self._cache_get(self._item_cache, cache_key)
+        if cached is not _MISSING:
+            return cached
+
         query_with_host = """
         SELECT i.itemid, i.hostid, i.name, i.history, i.trends, i.value_type,
             i.status, i.units, h.host
@@ -263,31 +990,21 @@ class ZabbixDB:
         AND h.status = 0 AND h.flags IN (0, 4)
         """
 
-        table_mapping = {
-            0: {'history': 'history', 'trends': 'trends'},
-            1: {'history': 'history_str', 'trends': None},
-            2: {'history': 'history_log', 'trends': None},
-            3: {'history': 'history_uint', 'trends': 'trends_uint'},
-            4: {'history': 'history_text', 'trends': None}
-        }
-
         try:
-            cursor = self.connection.cursor(dictionary=True)
             if hostname:
-                cursor.execute(query_with_host, (hostname, item_name))
+                results = self._exec('item_detail_host', query_with_host, (hostname, item_name))
             else:
-                cursor.execute(query_without_host, (item_name,))
-            
-            results = cursor.fetchall()
-            cursor.close()
+                results = self._exec('item_detail', query_without_host, (item_name,))
 
             if not results:
+                self._cache_set(self._item_cache, cache_key, None)
                 return None
 
             def map_item(item):
                 value_type = item['value_type']
-                if value_type not in table_mapping:
+                if not 0 <= value_type < len(self._TABLE_MAPPING):
                     raise RuntimeError(f"Invalid value_type {value_type} for item {item['name']}")
+                tables = self._TABLE_MAPPING[value_type]
                 return {
                     'hostname': item['host'],
                     'itemid': item['itemid'],
@@ -298,27 +1015,36 @@ class ZabbixDB:
                     'value_type': value_type,
                     'status': item['status'],
                     'units': item['units'],
-                    'history_table_name': table_mapping[value_type]['history'],
-                    'trends_table_name': table_mapping[value_type]['trends']
+                    'history_table_name': tables['history'],
+                    'trends_table_name': tables['trends']
                 }
 
             if hostname:
-                return map_item(results[0])
+                details = map_item(results[0])
             else:
-                return [map_item(item) for item in results]
+                details = [map_item(item) for item in results]
+            self._cache_set(self._item_cache, cache_key, details)
+            return details
 
+        except _CONNECTION_ERRORS:
+            raise  # left for @_retry
         except (MySQLError, PostgresError) as e:
-            raise RuntimeError(f"Failed to fetch item details: {str(e)}")
+            raise RuntimeError(f"Failed to fetch item details: {str(e)}") from e
 
-    def get_trend_data(self,itemid: str,time_from: int, time_to: int,trend_table_name: str,statistical_measure: str = None):
+    @_retry(times=3, backoff=0.2)
+    def get_trend_data(self,itemid: str,time_from: int, time_to: int,trend_table_name: str,statistical_measure: str = None, columnar: bool = False):
 
-            if not self.connection or not self.connection.is_connected():
+            if not self._alive():
                     return "No active database connection"
 
             # Whitelist valid history tables to prevent SQL injection
-            valid_tables = {'trends', 'trends_uint'}
-            if trend_table_name not in valid_tables:
+            if trend_table_name not in self._TREND_TABLES:
                 return f"Invalid history table name: {trend_table_name}"
+
+            cache_key = (itemid, time_from, time_to, trend_table_name, statistical_measure, columnar)
+            cached = self._cache_get(self._data_cache, cache_key)
+            if cached is not _MISSING:
+                return cached
             
             # Determine the value column based on the statistical measure
             if statistical_measure not in ['min','max','all']:
@@ -349,36 +1075,53 @@ class ZabbixDB:
                 ORDER BY clock DESC
                 """
             
-            try:
-                cursor = self.connection.cursor(dictionary=True)
-                cursor.execute(query, (itemid, time_from, time_to))
-                result = cursor.fetchall()
-                cursor.close()
+            if statistical_measure and statistical_measure != 'all':
+                if statistical_measure not in self._VALID_STATS:
+                    raise ValueError(f"Invalid statistical measure: {statistical_measure}")
 
-                if result is None:
-                    return []
-                if statistical_measure:
-                    valid_stats = {'min', 'max', 'mean', 'median', 'stdev', 'sum', 'count', 'range', 'mad', 'last', 'avg'}
-                    if statistical_measure not in valid_stats:
-                        return RuntimeError(f"Invalid statistical measure: {statistical_measure}")
-
-                # Compute the requested statistic
-                    return self.compute_statistic(result, statistical_measure)
-                return result            
-        
-            except (MySQLError, PostgresError) as e:
-                return RuntimeError(f"Query failed: {str(e)}")
+            variant = statistical_measure if statistical_measure in ('min', 'max', 'all') else 'avg'
+
+            if columnar and statistical_measure == 'all':
+                raise ValueError("columnar=True needs a single value column, not statistical_measure='all'")
+            if statistical_measure == 'last':
+                # The newest row alone, rather than the whole range over the wire
+                return self._fetch_last(itemid, time_from, time_to, trend_table_name)
+
+            scalar = bool(statistical_measure) and statistical_measure != 'all'
+
+            # COPY only where every value ends up in memory anyway (columnar output,
+            # median/MAD/describe); streaming statistics keep the named cursor
+            whole = columnar or (scalar and statistical_measure not in self._STREAMING_STATS)
+            if self.db_type == 'postgresql' and whole:
+                rows = self._copy_columns(query, (itemid, time_from, time_to))
+            else:
+                # 'all' carries four value columns, everything else is a plain (clock, value) tuple
+                rows = self._iter_rows(query, (itemid, time_from, time_to), f"{trend_table_name}_{variant}", dictionary=variant == 'all')
+            if scalar:
+                # Compute the requested statistic straight off the stream
+                result = self.compute_statistic(rows, statistical_measure)
+            elif columnar:
+                result = MetricColumns(*self._columns(rows))
+            else:
+                result = [_as_point(row) for row in rows]
+            self._cache_set(self._data_cache, cache_key, result)
+            return result
     
-    def get_history_data(self,itemid: str,time_from: int, time_to: int,history_table_name: str,statistical_measure: str = None):
+    @_retry(times=3, backoff=0.2)
+    def get_history_data(self,itemid: str,time_from: int, time_to: int,history_table_name: str,statistical_measure: str = None, columnar: bool = False):
 
-        if not self.connection or not self.connection.is_connected():
+        if not self._alive():
                 return "No active database connection"
 
         # Whitelist valid history tables to prevent SQL injection
-        valid_tables = {'history', 'history_str', 'history_log', 'history_uint', 'history_text'}
-        if history_table_name not in valid_tables:
+        if history_table_name not in self._HISTORY_TABLES:
             return f"Invalid history table name: {history_table_name}"
 
+        cache_key = (itemid, time_from, time_to, history_table_name, statistical_measure, columnar)
+        cached = self._cache_get(self._data_cache, cache_key)
+        if cached is not _MISSING:
+            return cached
+
         query = f"""
         SELECT clock, value
         FROM {history_table_name}
@@ -387,31 +1130,213 @@ class ZabbixDB:
         ORDER BY clock DESC
         """
 
-        try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(query, (itemid, time_from, time_to))
-            result = cursor.fetchall()
-            cursor.close()
+        if statistical_measure:
+            if statistical_measure not in self._VALID_STATS:
+                raise ValueError(f"Invalid statistical measure: {statistical_measure}")
 
-            if result is None:
-                return []
-            if statistical_measure:
-                valid_stats = {'min', 'max', 'mean', 'median', 'stdev', 'sum', 'count', 'range', 'mad', 'last', 'avg'}
-                if statistical_measure not in valid_stats:
-                    return RuntimeError(f"Invalid statistical measure: {statistical_measure}")
+        if statistical_measure == 'last':
+            # The newest row alone, rather than the whole range over the wire
+            return self._fetch_last(itemid, time_from, time_to, history_table_name)
 
-                # Compute the requested statistic
-                return self.compute_statistic(result, statistical_measure)
-            return result
-    
-        except (MySQLError, PostgresError) as e:
-            return RuntimeError(f"Query failed: {str(e)}")
+        if columnar and history_table_name not in self._NUMERIC_HISTORY_TABLES:
+            raise ValueError(f"columnar=True needs a numeric history table, not {history_table_name}")
+
+        # Numeric ranges on PostgreSQL come back fastest as one COPY stream, which is
+        # used only where every value ends up in memory anyway (columnar output,
+        # median/MAD/describe); streaming statistics keep the constant-memory named cursor
+        whole = columnar or (statistical_measure and statistical_measure not in self._STREAMING_STATS)
+        if self.db_type == 'postgresql' and whole and history_table_name in self._NUMERIC_HISTORY_TABLES:
+            rows = self._copy_columns(query, (itemid, time_from, time_to))
+        else:
+            rows = self._iter_rows(query, (itemid, time_from, time_to), history_table_name, dictionary=False)
+        if statistical_measure:
+            # Compute the requested statistic straight off the stream
+            result = self.compute_statistic(rows, statistical_measure)
+        elif columnar:
+            result = MetricColumns(*self._columns(rows))
+        else:
+            result = [_as_point(row) for row in rows]
+        self._cache_set(self._data_cache, cache_key, result)
+        return result
+
+    def _fetch_last(self, itemid: str, time_from: int, time_to: int, table_name: str):
+        """
+        Fetch the newest value of an item in a range with ORDER BY clock DESC LIMIT 1.
+
+        With the (itemid, clock) index Zabbix keeps on its history and trend
+        tables this is a backward index scan that stops at the first row,
+        instead of pulling the whole range to pick one row in Python.
+
+        Returns:
+            list: [{'clock': ..., 'value': ...}] or [] when the range is empty.
+        """
+        if table_name not in self._ALL_TABLES:
+            return f"Invalid history table name: {table_name}"
+
+        cache_key = ('last', itemid, time_from, time_to, table_name)
+        cached = self._cache_get(self._data_cache, cache_key)
+        if cached is not _MISSING:
+            return cached
+
+        value = 'value_avg AS value' if table_name.startswith('trends') else 'value'
+        query = f"""
+        SELECT clock, {value}
+        FROM {table_name}
+        WHERE itemid = %s
+        AND clock BETWEEN %s AND %s
+        ORDER BY clock DESC
+        LIMIT 1
+        """
+
+        # Database errors propagate, so get_history_data/get_trend_data can retry them
+        rows = self._exec(f"last_{table_name}", query, (itemid, time_from, time_to))
+        result = [{'clock': row['clock'], 'value': row['value']} for row in rows]
+        self._cache_set(self._data_cache, cache_key, result)
+        return result
+
+    def _value_column(self, table_name: str, statistical_measure: str = None) -> str:
+        """Column holding the values of ``table_name``: trends keep min/max/avg per hour."""
+        if not table_name.startswith('trends'):
+            return 'value'
+        return f"value_{statistical_measure}" if statistical_measure in ('min', 'max') else 'value_avg'
+
+    @_retry(times=3, backoff=0.2)
+    def _fetch_extreme(self, itemid: str, time_from: int, time_to: int, table_name: str, statistical_measure: str):
+        """
+        Fetch the rows holding the minimum or maximum value of a range.
+
+        The extreme is found by a scalar subquery, so only the matching rows
+        (usually one) come back instead of the whole range.
+
+        Returns:
+            list: [{'clock': ..., 'value': ...}, ...] newest first, or [] when the range is empty.
+        """
+        if table_name not in self._NUMERIC_TABLES:
+            return f"Invalid history table name: {table_name}"
+        if statistical_measure not in ('min', 'max'):
+            raise ValueError(f"Invalid statistical measure: {statistical_measure}")
+
+        cache_key = ('extreme', itemid, time_from, time_to, table_name, statistical_measure)
+        cached = self._cache_get(self._data_cache, cache_key)
+        if cached is not _MISSING:
+            return cached
+
+        col = self._value_column(table_name, statistical_measure)
+        query = f"""
+        SELECT clock, {col} AS value
+        FROM {table_name}
+        WHERE itemid = %s
+        AND clock BETWEEN %s AND %s
+        AND {col} = (
+            SELECT {self._SQL_AGG[statistical_measure].format(col=col)}
+            FROM {table_name}
+            WHERE itemid = %s
+            AND clock BETWEEN %s AND %s
+        )
+        ORDER BY clock DESC
+        """
+
+        rows = self._exec(f"{statistical_measure}_{table_name}", query, (itemid, time_from, time_to, itemid, time_from, time_to))
+        result = [{'clock': row['clock'], 'value': row['value']} for row in rows]
+        self._cache_set(self._data_cache, cache_key, result)
+        return result
+
+    def _agg_value(self, row, statistical_measure: str):
+        """Turn a ``value, num`` aggregate row into the compute_statistic-style result."""
+        if not row or not row['num'] or row['value'] is None:
+            return []
+        if statistical_measure == 'count':
+            return int(row['value'])
+        return float(row['value'])
+
+    def _agg_column(self, col: str, statistical_measure: str) -> str:
+        """
+        SQL for the values an aggregate reduces: rounded to 2 decimals, as
+        compute_statistic rounds them client-side, except for min/max, which
+        match rows exactly on the stored values.
+        """
+        if statistical_measure in ('min', 'max'):
+            return col
+        if self.db_type == 'postgresql':
+            # PostgreSQL only rounds numeric to a number of places
+            return f"round({col}::numeric, 2)::float8"
+        return f"ROUND({col}, 2)"
+
+    def _agg_expr(self, statistical_measure: str):
+        """SQL template reducing ``statistical_measure`` on this database, or None if it has to run client-side."""
+        if statistical_measure in self._SQL_AGG:
+            return self._SQL_AGG[statistical_measure]
+        if self.db_type == 'postgresql':
+            return self._PG_SQL_AGG.get(statistical_measure)
+        return None
+
+    @_retry(times=3, backoff=0.2)
+    def _aggregate(self, itemid: str, time_from: int, time_to: int, table_name: str, statistical_measure: str):
+        """Run one _agg_expr reduction over a range; shared by get_history_data_agg and get_trend_data_agg."""
+        if not self._alive():
+                return "No active database connection"
+
+        expr = self._agg_expr(statistical_measure)
+        if expr is None:
+            raise ValueError(f"Invalid statistical measure: {statistical_measure}")
+
+        cache_key = ('agg', itemid, time_from, time_to, table_name, statistical_measure)
+        cached = self._cache_get(self._data_cache, cache_key)
+        if cached is not _MISSING:
+            return cached
+
+        col = self._agg_column(self._value_column(table_name, statistical_measure), statistical_measure)
+        query = f"""
+        SELECT {expr.format(col=col, table=table_name)} AS value, COUNT(*) AS num
+        FROM {table_name}
+        WHERE itemid = %s
+        AND clock BETWEEN %s AND %s
+        """
+        # Any subquery in expr filters on the same range and comes first in the text
+        params = (itemid, time_from, time_to) * (1 + expr.count('%s') // 3)
+
+        rows = self._exec(f"agg_{table_name}_{statistical_measure}", query, params)
+        result = self._agg_value(rows[0] if rows else None, statistical_measure)
+        self._cache_set(self._data_cache, cache_key, result)
+        return result
+
+    def get_history_data_agg(self, itemid: str, time_from: int, time_to: int, history_table_name: str, statistical_measure: str):
+        """
+        Compute a scalar statistic over a history range inside the database.
+
+        Supports the measures in _SQL_AGG, plus 'median', 'mad' and 'nmad' on
+        PostgreSQL (percentile_cont). 'min'/'max' rows with their clocks go
+        through _fetch_extreme; 'last', and median/MAD on MySQL, through
+        get_history_data.
+
+        Returns:
+            float/int result, or [] when the range holds no (or too few) values.
+        """
+        if history_table_name not in self._NUMERIC_HISTORY_TABLES:
+            return f"Invalid history table name: {history_table_name}"
+        return self._aggregate(itemid, time_from, time_to, history_table_name, statistical_measure)
+
+    def get_trend_data_agg(self, itemid: str, time_from: int, time_to: int, trend_table_name: str, statistical_measure: str):
+        """
+        Compute a scalar statistic over a trend range inside the database.
+
+        Works on the same column get_trend_data would return: value_min for
+        'min', value_max for 'max' and value_avg otherwise.
+
+        Returns:
+            float/int result, or [] when the range holds no (or too few) values.
+        """
+        if trend_table_name not in self._TREND_TABLES:
+            return f"Invalid history table name: {trend_table_name}"
+        return self._aggregate(itemid, time_from, time_to, trend_table_name, statistical_measure)
+
+    def _thresholds(self, history_days, trends_days):
+        """Oldest clock still kept in history and in trends, as (history, trends)."""
+        now = int(time.time())
+        return now - int(history_days * 86400), now - int(trends_days * 86400)
 
     def get_function_name(self,time_from: int, time_to: int,history_days, trends_days):
-        current_time = float(datetime.now().timestamp())
-        seconds_in_day = float(86400)
-        history_threshold = int(current_time - (history_days * seconds_in_day))
-        trends_threshold = int(current_time - (trends_days * seconds_in_day))
+        history_threshold, trends_threshold = self._thresholds(history_days, trends_days)
 
         if time_to < trends_threshold:
             return "No data - too old"
@@ -420,10 +1345,59 @@ class ZabbixDB:
         elif time_to <= history_threshold and time_from >= trends_threshold:
             return "get_trends"
         elif time_from < history_threshold and time_to >= history_threshold:
-            return "get_trends"
+            return "get_trends_and_history"
         else:
             return "Invalid range"
 
+    def _get_combined(self, itemid: str, time_from: int, time_to: int, history_table: str, trends_table: str, statistical_measure: str = None, split: int = None):
+        """
+        Fetch a range that spans both history and trends in one round-trip.
+
+        Both sides are read with a single ``UNION ALL`` query. When ``split``
+        (the oldest clock still kept in history) is given, trends only cover
+        the range before it and history the range from it on, so no period is
+        counted twice.
+        """
+        if history_table not in self._NUMERIC_HISTORY_TABLES:
+            return f"Invalid history table name: {history_table}"
+        if trends_table not in self._TREND_TABLES:
+            return f"Invalid history table name: {trends_table}"
+
+        trends_to, history_from = time_to, time_from
+        if split is not None:
+            trends_to, history_from = min(time_to, split - 1), max(time_from, split)
+
+        cache_key = (itemid, time_from, trends_to, history_from, time_to, history_table, statistical_measure)
+        cached = self._cache_get(self._data_cache, cache_key)
+        if cached is not _MISSING:
+            return cached
+
+        trend_col = f"value_{statistical_measure}" if statistical_measure in ('min', 'max') else 'value_avg'
+        query = f"""
+        SELECT clock, value
+        FROM {history_table}
+        WHERE itemid = %s
+        AND clock BETWEEN %s AND %s
+        UNION ALL
+        SELECT clock, {trend_col} as value
+        FROM {trends_table}
+        WHERE itemid = %s
+        AND clock BETWEEN %s AND %s
+        ORDER BY clock DESC
+        """
+        if statistical_measure == 'last':
+            query += "LIMIT 1\n"
+        params = (itemid, history_from, time_to, itemid, time_from, trends_to)
+        sql_key = f"combined_{history_table}_{trend_col}{'_last' if statistical_measure == 'last' else ''}"
+
+        rows = self._iter_rows(query, params, sql_key, dictionary=False)
+        if statistical_measure:
+            result = self.compute_statistic(rows, statistical_measure)
+        else:
+            result = [_as_point(row) for row in rows]
+        self._cache_set(self._data_cache, cache_key, result)
+        return result
+
     def get_metric_data(self, hostname: str, metric_name: str, time_from: int, time_to: int, statistical_measure: str = None):
         """
         Fetch historical data for a specific metric (item) of a host within a time range.
@@ -434,8 +1408,10 @@ class ZabbixDB:
                 hostname, metric_name, "unknown", statistical_measure
             )
 
+        # Both lookups run on this connection, whose prepared statements are already
+        # warm; a second pooled connection would cost more round-trips than it saves
         monitoring_status = self.get_monitoring_Status(hostname)
-        item_details = self.get_item_detail(metric_name,hostname)
+        item_details = self.get_item_detail(metric_name, hostname)
 
         if item_details is None:
             message = f"Item '{metric_name}' not found for host '{hostname}'"
@@ -453,7 +1429,7 @@ class ZabbixDB:
         if not history_table:
             return self._error_response(f"No valid history table for item '{metric_name}' with value_type {item_details['value_type']}", hostname, metric_name, item_details['units'], statistical_measure)
 
-        if history_table not in ['history_str', 'history_log', 'history_text']:
+        if history_table in self._NUMERIC_HISTORY_TABLES:
             function_name = self.get_function_name(
                 time_from, time_to,
                 self.convert_day(item_details['history']),
@@ -465,8 +1441,7 @@ class ZabbixDB:
 
         try:
             if statistical_measure:
-                valid_stats = {'min', 'max', 'mean', 'median', 'stdev', 'sum', 'count', 'range', 'mad', 'last', 'avg'}
-                if statistical_measure not in valid_stats:
+                if statistical_measure not in self._VALID_STATS:
                     return self._error_response(
                         f"Invalid statistical measure: {statistical_measure}",
                         hostname, metric_name, item_details['units'], statistical_measure
@@ -474,41 +1449,19 @@ class ZabbixDB:
 
             itemid = item_details['itemid']
 
-            def fetch_history():
-                return self.get_history_data(itemid, time_from, time_to, history_table, statistical_measure)
-
-            def fetch_trends():
-                return self.get_trend_data(itemid, time_from, time_to, trends_table, statistical_measure)
-
-            # Fetch function definitions
-            def fetch_history_with_stats():
-                data = fetch_history()
-                return self.compute_statistic(data, statistical_measure) if data else []
-
-            def fetch_trends_with_stats():
-                data = fetch_trends()
-                return self.compute_statistic(data, statistical_measure) if data else []
-
-            # def fetch_both_with_stats():
-            #     history_data = fetch_history()
-            #     trend_data = fetch_trends()
-            #     if not history_data and not trend_data:
-            #         return []
-            #     combined = (history_data or []) + (trend_data or [])
-            #     return self.compute_statistic(combined, statistical_measure)
-
-            # def fetch_both_raw():
-            #     history_data = fetch_history()
-            #     trend_data = fetch_trends()
-            #     return (history_data or []) + (trend_data or [])
-
-            fetch_func = {
-                "get_history": fetch_history,
-                "get_trends": fetch_trends,
-                # "get_trends_and_history": fetch_both_with_stats if statistical_measure else fetch_both_raw
-            }
-
-            data = fetch_func[function_name]()
+            if function_name == "get_history":
+                data = self._fetch_range(itemid, time_from, time_to, history_table, statistical_measure)
+            elif function_name == "get_trends":
+                data = self._fetch_range(itemid, time_from, time_to, trends_table, statistical_measure)
+            elif function_name == "get_trends_and_history":
+                history_threshold, _ = self._thresholds(
+                    self.convert_day(item_details['history']),
+                    self.convert_day(item_details['trends'])
+                )
+                data = self._get_combined(itemid, time_from, time_to, history_table, trends_table, statistical_measure, history_threshold)
+            else:
+                # "No data - too old" / "Invalid range"
+                return self._error_response(f"Cannot fetch data: {function_name}", hostname, metric_name, item_details['units'], statistical_measure)
 
             return self._success_response(
                 data=data,
@@ -524,10 +1477,265 @@ class ZabbixDB:
                 f"Query failed: {str(e)}", hostname, metric_name, item_details['units'], statistical_measure
             )
 
-    def get_all_alerts(self):
-        if not self.connection or not self.connection.is_connected():
-            return "No active database connection"
+    def _fetch_range(self, itemid: str, time_from: int, time_to: int, table_name: str, statistical_measure: str = None):
+        """
+        Data or statistic for one history or trend range, reduced in SQL where possible.
+
+        min/max rows go through _fetch_extreme and other measures the database
+        can compute through the *_agg methods; 'last' (served by _fetch_last),
+        raw ranges and client-side statistics (median/MAD on MySQL) through
+        get_history_data/get_trend_data. All of them retry connection errors
+        and let database errors propagate.
+        """
+        is_history = table_name in self._HISTORY_TABLES
+        if statistical_measure in ('min', 'max'):
+            return self._fetch_extreme(itemid, time_from, time_to, table_name, statistical_measure)
+        if self._agg_expr(statistical_measure) is not None:
+            aggregate = self.get_history_data_agg if is_history else self.get_trend_data_agg
+            return aggregate(itemid, time_from, time_to, table_name, statistical_measure)
+        fetch = self.get_history_data if is_history else self.get_trend_data
+        return fetch(itemid, time_from, time_to, table_name, statistical_measure)
+
+    def _get_items_bulk(self, pairs: list) -> dict:
+        """
+        Item and host rows for many (hostname, metric_name) pairs from one JOIN.
+
+        Returns:
+            dict: {(hostname, metric_name): row}, the row carrying the item
+            columns plus ``host_status``; pairs with no item are missing.
+        """
+        pairs_sql = ', '.join(['(%s, %s)'] * len(pairs))
+        items_query = f"""
+        SELECT i.itemid, i.hostid, i.name, i.history, i.trends, i.value_type,
+            i.status, i.units, h.host, h.status AS host_status
+        FROM items i
+        JOIN hosts h ON i.hostid = h.hostid
+        WHERE (h.host, i.name) IN ({pairs_sql})
+        """
+        items = {}
+        for row in self._iter_rows(items_query, [value for pair in pairs for value in pair]):
+            items.setdefault((row['host'], row['name']), row)
+        return items
+
+    def get_metric_data_many(self, pairs: list, time_from: int, time_to: int, statistical_measure: str = None, items: dict = None):
+        """
+        Batched get_metric_data for many (hostname, metric_name) pairs.
+
+        Item and host metadata for every pair comes back from one JOIN, and the
+        data from one query per table and time range with ``itemid IN (...)``,
+        instead of three or four round-trips per pair. 'last' and 'min'/'max'
+        are found per item in SQL (``GROUP BY itemid`` derived tables), and the
+        other scalar measures the database can compute are reduced there too,
+        so one row per item comes back rather than the whole range. Ranges that
+        span history and trends are split at the history threshold exactly as
+        get_metric_data does.
+
+        Args:
+            pairs (list): (hostname, metric_name) tuples.
+            time_from (int): Start of the range (Unix timestamp).
+            time_to (int): End of the range (Unix timestamp).
+            statistical_measure (str, optional): Same measures as get_metric_data.
+            items (dict, optional): Item rows already at hand, keyed by pair, with
+                the get_item_detail columns plus ``host_status``; saves the JOIN.
+
+        Returns:
+            list: One get_metric_data style response per pair, in input order.
+        """
+        pairs = [tuple(pair) for pair in pairs]
+        if not pairs:
+            return []
+
+        if time_from > time_to:
+            return [
+                self._error_response("Invalid time range: 'time_from' must be less than 'time_to'", host, metric, "unknown", statistical_measure)
+                for host, metric in pairs
+            ]
+
+        if statistical_measure and statistical_measure not in self._VALID_STATS:
+            return [
+                self._error_response(f"Invalid statistical measure: {statistical_measure}", host, metric, "unknown", statistical_measure)
+                for host, metric in pairs
+            ]
+
+        if not self._alive():
+            raise RuntimeError("No active database connection")
+
+        try:
+            if items is None:
+                items = self._get_items_bulk(pairs)
+
+            # Work out which table(s) and range(s) each pair reads, then group itemids per query
+            responses = {}
+            plans = {}
+            itemids_by_segment = defaultdict(list)
+            for pair in dict.fromkeys(pairs):
+                host, metric = pair
+                item = items.get(pair)
+                if item is None:
+                    responses[pair] = self._error_response(f"Item '{metric}' not found for host '{host}'", host, metric, "unknown", statistical_measure)
+                    continue
+                if item['host_status'] == 1:
+                    responses[pair] = self._error_response(f"Host '{host}' is disabled", host, metric, "unknown")
+                    continue
+                if item['status'] != 0:
+                    responses[pair] = self._error_response(f"Item '{metric}' is disabled", host, metric, item['units'])
+                    continue
+
+                value_type = item['value_type']
+                tables = self._TABLE_MAPPING[value_type] if 0 <= value_type < len(self._TABLE_MAPPING) else None
+                if not tables:
+                    responses[pair] = self._error_response(f"No valid history table for item '{metric}' with value_type {item['value_type']}", host, metric, item['units'], statistical_measure)
+                    continue
+
+                measure = statistical_measure
+                if tables['trends'] is None:
+                    function_name = "get_history"
+                    measure = measure if measure == 'last' else None # No statistics for string/log/text history
+                else:
+                    history_days = self.convert_day(item['history'])
+                    trends_days = self.convert_day(item['trends'])
+                    function_name = self.get_function_name(time_from, time_to, history_days, trends_days)
+
+                # Segments newest first, so concatenated rows stay in ORDER BY clock DESC order
+                if function_name == "get_history":
+                    segments = [(tables['history'], time_from, time_to)]
+                elif function_name == "get_trends":
+                    segments = [(tables['trends'], time_from, time_to)]
+                elif function_name == "get_trends_and_history":
+                    split, _ = self._thresholds(history_days, trends_days)
+                    segments = [
+                        (tables['history'], max(time_from, split), time_to),
+                        (tables['trends'], time_from, min(time_to, split - 1))
+                    ]
+                else:
+                    responses[pair] = self._error_response(f"Cannot fetch data: {function_name}", host, metric, item['units'], statistical_measure)
+                    continue
+
+                if measure == 'last':
+                    mode = 'last'
+                elif measure in ('min', 'max'):
+                    mode = 'extreme'
+                elif measure in self._SQL_AGG and len(segments) == 1:
+                    mode = 'agg'
+                else:
+                    # Everything else, and SQL aggregates over both tables, as get_metric_data
+                    # does it: on the rows, client-side
+                    mode = 'rows'
+
+                plans[pair] = (item, segments, measure, mode)
+                for segment in segments:
+                    itemids_by_segment[(*segment, mode)].append(item['itemid'])
+
+            # One query per (table, range, mode), results bucketed per (itemid, segment)
+            results = defaultdict(list)
+            for (table, seg_from, seg_to, mode), itemids in itemids_by_segment.items():
+                in_sql = ', '.join(['%s'] * len(itemids))
+                col = self._value_column(table, statistical_measure)
+                if mode == 'agg':
+                    query = f"""
+                    SELECT itemid, {self._SQL_AGG[statistical_measure].format(col=self._agg_column(col, statistical_measure))} AS value, COUNT(*) AS num
+                    FROM {table}
+                    WHERE itemid IN ({in_sql})
+                    AND clock BETWEEN %s AND %s
+                    GROUP BY itemid
+                    """
+                    params = (*itemids, seg_from, seg_to)
+                elif mode == 'last':
+                    # Newest clock per item, then its row; an index lookup per item, not the range
+                    query = f"""
+                    SELECT t.itemid, t.clock, t.{col} AS value
+                    FROM {table} t
+                    JOIN (
+                        SELECT itemid, MAX(clock) AS clock
+                        FROM {table}
+                        WHERE itemid IN ({in_sql})
+                        AND clock BETWEEN %s AND %s
+                        GROUP BY itemid
+                    ) m ON m.itemid = t.itemid AND m.clock = t.clock
+                    """
+                    params = (*itemids, seg_from, seg_to)
+                elif mode == 'extreme':
+                    # As _fetch_extreme: every row holding the item's MIN/MAX, exact on the stored value
+                    query = f"""
+                    SELECT t.itemid, t.clock, t.{col} AS value
+                    FROM {table} t
+                    JOIN (
+                        SELECT itemid, {self._SQL_AGG[statistical_measure].format(col=col)} AS value
+                        FROM {table}
+                        WHERE itemid IN ({in_sql})
+                        AND clock BETWEEN %s AND %s
+                        GROUP BY itemid
+                    ) m ON m.itemid = t.itemid AND m.value = t.{col}
+                    WHERE t.clock BETWEEN %s AND %s
+                    ORDER BY t.clock DESC
+                    """
+                    params = (*itemids, seg_from, seg_to, seg_from, seg_to)
+                else:
+                    query = f"""
+                    SELECT itemid, clock, {col} AS value
+                    FROM {table}
+                    WHERE itemid IN ({in_sql})
+                    AND clock BETWEEN %s AND %s
+                    ORDER BY clock DESC
+                    """
+                    params = (*itemids, seg_from, seg_to)
+
+                segment = (table, seg_from, seg_to)
+                for row in self._iter_rows(query, params):
+                    key = (row['itemid'], segment)
+                    if mode == 'agg':
+                        results[key] = self._agg_value(row, statistical_measure)
+                    elif mode == 'last' and results[key]:
+                        continue  # several rows can share the newest clock; keep one
+                    else:
+                        results[key].append({'clock': row['clock'], 'value': row['value']})
+
+            for pair, (item, segments, measure, mode) in plans.items():
+                host, metric = pair
+                parts = [results.get((item['itemid'], segment), []) for segment in segments]
+                if mode == 'agg':
+                    # Items with no rows in range are absent from the GROUP BY result
+                    data = parts[0]
+                elif mode == 'last':
+                    # History holds the newer segment, so its row wins when there is one
+                    data = next((part for part in parts if part), [])
+                elif mode == 'extreme':
+                    rows = [row for part in parts for row in part]
+                    if rows:
+                        pick = min if measure == 'min' else max
+                        target = pick(row['value'] for row in rows)
+                        rows = [row for row in rows if row['value'] == target]
+                    data = rows
+                else:
+                    data = [row for part in parts for row in part]
+                    if measure:
+                        data = self.compute_statistic(data, measure)
+                responses[pair] = self._success_response(
+                    data=data,
+                    hostname=host,
+                    metric_name=metric,
+                    unit=item['units'],
+                    statistical_measure=measure
+                )
+
+            return [responses[pair] for pair in pairs]
+
+        except (MySQLError, PostgresError) as e:
+            return [
+                self._error_response(f"Query failed: {str(e)}", host, metric, "unknown", statistical_measure)
+                for host, metric in pairs
+            ]
+
+    def _build_alerts_query(self, time_from: int = None, time_to: int = None, hostname: str = None, host_group: str = None, limit: int = None, ordered: bool = True):
+        """
+        Build the alert query with every filter pushed into the WHERE clause.
+
+        With ``ordered=False`` the ORDER BY/LIMIT tail is left off, for use as
+        a derived table.
 
+        Returns:
+            tuple: (query, params) ready for cursor.execute().
+        """
         query = '''
             SELECT DISTINCT
                 h.name AS host,
@@ -550,56 +1758,119 @@ class ZabbixDB:
                 h.status = 0
                 AND h.flags IN (0, 4)
         '''
+        params = []
+
+        if time_from is not None and time_to is not None:
+            query += " AND e.clock BETWEEN %s AND %s"
+            params.extend((time_from, time_to))
+        elif time_from is not None:
+            query += " AND e.clock >= %s"
+            params.append(time_from)
+        elif time_to is not None:
+            query += " AND e.clock <= %s"
+            params.append(time_to)
+        if hostname is not None:
+            query += " AND h.name = %s"
+            params.append(hostname)
+        # 'all' means every monitored host, which the base query already selects
+        if host_group is not None and host_group.lower() != 'all':
+            query += '''
+                AND h.hostid IN (
+                    SELECT hg.hostid
+                    FROM hosts_groups hg
+                    JOIN hstgrp g ON g.groupid = hg.groupid
+                    WHERE g.name = %s
+                )
+            '''
+            params.append(host_group)
 
-        try:
-            with self.connection.cursor(dictionary=True) as cursor:
-                cursor.execute(query)
-                result = cursor.fetchall()
+        if not ordered:
+            return query, tuple(params)
 
-            return result if result else "No alerts history found"
+        query += " ORDER BY start_time DESC"
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
 
-        except (MySQLError, PostgresError) as e:
-            return f"Query failed: {str(e)}"
+        return query, tuple(params)
 
-    def get_alerts(self,time_from: int = None, time_to: int = None, hostname: str = None, limit: int = None, host_group: str = None):
-        alerts = pd.DataFrame(self.get_all_alerts())
-        alerts = alerts.sort_values(by='start_time', ascending=False)
-        
-        if time_from is not None:
-            alerts = alerts[alerts['start_time'] >= time_from]
-        if time_to is not None:
-            alerts = alerts[alerts['start_time'] <= time_to]
-        if hostname is not None:
-            alerts = alerts[alerts['host'] == hostname]
-        if host_group is not None:
-            host_list = self.get_host_by_group(host_group)
-            host_in_group = [h['host_name'] for h in host_list]
-            alerts = alerts[alerts['host'].isin(host_in_group)]
+    @_retry(times=3, backoff=0.2)
+    def get_all_alerts(self, time_from: int = None, time_to: int = None, hostname: str = None, host_group: str = None, limit: int = None):
+        if not self._alive():
+            return "No active database connection"
 
-        if limit is not None:
-            alerts = alerts.head(limit)
+        cache_key = (time_from, time_to, hostname, host_group, limit)
+        cached = self._cache_get(self._alerts_cache, cache_key)
+        if cached is not _MISSING:
+            return cached
+
+        query, params = self._build_alerts_query(time_from, time_to, hostname, host_group, limit)
+
+        # Rows stream in _FETCH_SIZE batches rather than being buffered by the driver first.
+        result = list(self._iter_rows(query, params))
 
-        return alerts
+        if not result:
+            return "No alerts history found"
+        self._cache_set(self._alerts_cache, cache_key, result)
+        return result
+
+    def get_alerts(self,time_from: int = None, time_to: int = None, hostname: str = None, limit: int = None, host_group: str = None):
+        """
+        Return alerts newest first as a list of dicts, filtered in SQL.
+        """
+        alerts = self.get_all_alerts(time_from, time_to, hostname, host_group, limit)
+        # get_all_alerts reports "nothing found" as a message string
+        return alerts if isinstance(alerts, list) else []
 
     def get_common_issues(self, time_from: int = None, time_to: int = None, hostname: str = None, limit: int = None, host_group: str = None):
-        alerts=self.get_alerts(time_from, time_to, hostname,host_group)
+        """
+        Alert counts per event name, most frequent first.
 
-        common_issues = alerts.groupby('event_name').agg(
-            total_count=('eventid', 'count'),
-            acknowledged_count=('acknowledged', lambda x: (x == 1).sum()),
-            unacknowledged_count=('acknowledged', lambda x: (x == 0).sum())
-        ).reset_index().sort_values(by='total_count', ascending=False)
+        The grouping runs in SQL over the same de-duplicated rows get_alerts
+        returns, so only one row per event name comes back.
+        """
+        if not self._alive():
+            return "No active database connection"
 
-        common_issues = common_issues.head(limit)
+        cache_key = ('issues', time_from, time_to, hostname, host_group, limit)
+        common_issues = self._cache_get(self._alerts_cache, cache_key)
+        if common_issues is _MISSING:
+            alerts_query, params = self._build_alerts_query(time_from, time_to, hostname, host_group, ordered=False)
+            query = f"""
+            SELECT
+                a.event_name,
+                COUNT(*) AS total_count,
+                SUM(a.acknowledged) AS acknowledged_count,
+                COUNT(*) - SUM(a.acknowledged) AS unacknowledged_count
+            FROM ({alerts_query}) a
+            GROUP BY a.event_name
+            ORDER BY total_count DESC, MAX(a.start_time) DESC
+            """
+            if limit is not None:
+                query += " LIMIT %s"
+                params += (limit,)
+
+            common_issues = [
+                {
+                    'event_name': row['event_name'],
+                    'total_count': int(row['total_count']),
+                    'acknowledged_count': int(row['acknowledged_count']),
+                    'unacknowledged_count': int(row['unacknowledged_count'])
+                }
+                for row in self._iter_rows(query, params)
+            ]
+            if common_issues:
+                self._cache_set(self._alerts_cache, cache_key, common_issues)
 
-        if common_issues.empty:
+        if not common_issues:
             return {
                 "status": "error",
                 "message": "No common issues found",
                 "data": []
             }
+
         return self._success_response(
-            data=common_issues.to_dict(orient='records'),
+            data=common_issues,
             hostname=hostname,
             time_from=time_from,
             time_to=time_to,
@@ -615,45 +1886,53 @@ class ZabbixDB:
         if not isinstance(item_details, list):
             item_details = [item_details]
 
-        hostnames = list({item['hostname'] for item in item_details})
-        
-        rows = []
-        for host in hostnames:
-            metric_data = self.get_metric_data(
-                hostname=host,
-                metric_name=metric_name,
-                time_from=time_from,
-                time_to=time_to,
-                statistical_measure=statistical_measure
-            )
-            
+        # get_item_detail only returns items of monitored hosts; reuse its rows for the batch
+        items = {}
+        for item in item_details:
+            items.setdefault((item['hostname'], metric_name), {**item, 'host_status': 0})
+
+        # One batched lookup for every host instead of a get_metric_data round-trip set per host
+        results = self.get_metric_data_many(list(items), time_from, time_to, statistical_measure, items=items)
+
+        # Column lists rather than row dicts, so the frame is built without per-row inference
+        hosts, units, clocks, values = [], [], [], []
+        for metric_data in results:
             if metric_data:
+                hostname = metric_data.get("hostname")
+                unit = metric_data.get("unit")
                 data_points = metric_data.get("data")
                 if isinstance(data_points, list) and len(data_points) > 0 and isinstance(data_points[0], dict):
                     # Expand each dict inside 'data' list into separate rows
                     for point in data_points:
-                        rows.append({
-                            "hostname": metric_data.get("hostname"),
-                            "unit": metric_data.get("unit"),
-                            "clock": point.get("clock"),
-                            "value": point.get("value")
-                        })
+                        hosts.append(hostname)
+                        units.append(unit)
+                        clocks.append(point.get("clock"))
+                        values.append(point.get("value"))
                 else:
                     # Handle if data is a single value or empty list
-                    rows.append({
-                        "hostname": metric_data.get("hostname"),
-                        "unit": metric_data.get("unit"),
-                        "clock": None,
-                        "value": data_points if data_points else None
-                    })
-    
-        if limit is not None:
-            rows = rows[:limit]
+                    hosts.append(hostname)
+                    units.append(unit)
+                    clocks.append(None)
+                    values.append(data_points if data_points else None)
 
-        df = pd.DataFrame(rows, columns=['hostname', 'unit', 'clock', 'value'])
-        # Convert clock column to Int64 dtype (nullable integer) so NaNs are preserved
-        df['clock'] = pd.to_numeric(df['clock'], errors='coerce').astype('Int64')
-        df = df.sort_values(by='value', ascending=False, na_position='last')
+        if limit is not None:
+            hosts, units, clocks, values = hosts[:limit], units[:limit], clocks[:limit], values[:limit]
+
+        df = pd.DataFrame({
+            'hostname': hosts,
+            'unit': units,
+            # Nullable integer so missing clocks stay <NA>
+            'clock': pd.array(clocks, dtype='Int64'),
+            'value': values,
+        })
+        if statistical_measure == 'describe':
+            # describe() summaries are dicts, which do not order; rank hosts by their mean
+            df = df.sort_values(
+                by='value', ascending=False, na_position='last',
+                key=lambda col: col.map(lambda v: v.get('mean') if isinstance(v, dict) else None).astype(float)
+            )
+        else:
+            df = df.sort_values(by='value', ascending=False, na_position='last')
 
         return self._success_response(
             data=df.to_dict(orient='records'),
@@ -702,7 +1981,7 @@ class ZabbixDB:
         Raises:
             RuntimeError: If database connection is not established or query fails.
         """
-        if not self.connection or not self.connection.is_connected():
+        if not self._alive():
             return RuntimeError("Database connection not established")
 
         host_status_query = """
@@ -712,10 +1991,8 @@ class ZabbixDB:
         """
         
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(host_status_query, (hostname,))
-            result = cursor.fetchone()
-            cursor.close()
+            rows = self._exec('host_status', host_status_query, (hostname,))
+            result = rows[0] if rows else None
 
             if result['status'] != 1:
                 return {
@@ -772,13 +2049,7 @@ if __name__ == "__main__":
             # print(zbx.time_difference(1747751299, 1747837706))
             # print(zbx.convert_day('1h'))
 
-            # print(zbx.compute_statistic(result['data'], 'mean'))
-            # print(zbx.compute_statistic(result['data'], 'median'))
-            # print(zbx.compute_statistic(result['data'], 'min'))
-            # print(zbx.compute_statistic(result['data'], 'max'))
-            # print(zbx.compute_statistic(result['data'], 'stdev'))
-            # print(zbx.compute_statistic(result['data'], 'sum'))
-            # print(zbx.compute_statistic(result['data'], 'count'))
+            # print(zbx.describe(result['data']))
 
     except (RuntimeError, ValueError) as e:
         print(f"Error: {str(e)}")
\ No newline at end of file